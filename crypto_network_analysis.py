@@ -17,12 +17,27 @@ import os
 import sys
 import time
 import json
+import hashlib
+import importlib.util
 import logging
+import pickle
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import numpy as np
+import matplotlib
+# 无图形界面时（如服务器批处理）使用Agg后端，必须在导入pyplot之前设置
+HEADLESS = (sys.platform.startswith('linux') and
+            not os.environ.get('DISPLAY') and not os.environ.get('WAYLAND_DISPLAY'))
+if HEADLESS:
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import warnings
@@ -32,8 +47,43 @@ warnings.filterwarnings('ignore')
 from idtxl.data import Data
 from idtxl.multivariate_te import MultivariateTE
 from idtxl.multivariate_mi import MultivariateMI
+from idtxl.results import ResultsNetworkInference
+from idtxl.stats import network_fdr
 from idtxl.visualise_graph import plot_network
 
+# joblib为可选依赖，用于按目标节点并行执行传递熵分析
+try:
+    from joblib import Parallel, delayed
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+
+# orjson为可选依赖，用于加速API响应的JSON解析
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# numba为可选依赖，用于JIT编译相关资产对提取循环
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+# pyopencl为可选依赖，检测到GPU时使用OpenCL版Kraskov估计器
+try:
+    import pyopencl as cl
+    OPENCL_AVAILABLE = True
+except ImportError:
+    OPENCL_AVAILABLE = False
+
+# pyarrow/fastparquet为可选依赖，用于读写价格缓存；仅检测是否安装，实际读写时由pandas导入
+PARQUET_AVAILABLE = any(importlib.util.find_spec(engine) is not None
+                        for engine in ('pyarrow', 'fastparquet'))
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -46,16 +96,165 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _lagged_corr_screen(X: np.ndarray, min_lag: int, max_lag: int) -> np.ndarray:
+    """计算滞后Pearson相关的最大绝对值，out[源, 目标] = max_lag |corr(源_{t-lag}, 目标_t)|"""
+    n_processes, n_samples = X.shape
+    out = np.zeros((n_processes, n_processes))
+    for target in prange(n_processes):
+        for source in range(n_processes):
+            if source == target:
+                continue
+            best = 0.0
+            for lag in range(min_lag, max_lag + 1):
+                n = n_samples - lag
+                mean_s = 0.0
+                mean_t = 0.0
+                for k in range(n):
+                    mean_s += X[source, k]
+                    mean_t += X[target, k + lag]
+                mean_s /= n
+                mean_t /= n
+                cov = 0.0
+                var_s = 0.0
+                var_t = 0.0
+                for k in range(n):
+                    ds = X[source, k] - mean_s
+                    dt = X[target, k + lag] - mean_t
+                    cov += ds * dt
+                    var_s += ds * ds
+                    var_t += dt * dt
+                if var_s > 0.0 and var_t > 0.0:
+                    r = abs(cov / np.sqrt(var_s * var_t))
+                    if r > best:
+                        best = r
+            out[source, target] = best
+    return out
+
+
+def _lagged_corr_screen_numpy(X: np.ndarray, min_lag: int, max_lag: int) -> np.ndarray:
+    """_lagged_corr_screen的NumPy实现（未安装numba时使用），每个滞后一次矩阵乘法"""
+    n_processes, n_samples = X.shape
+    out = np.zeros((n_processes, n_processes))
+    for lag in range(min_lag, max_lag + 1):
+        past = X[:, :n_samples - lag]
+        present = X[:, lag:]
+        past = (past - past.mean(axis=1, keepdims=True)) / past.std(axis=1, keepdims=True)
+        present = (present - present.mean(axis=1, keepdims=True)) / present.std(axis=1, keepdims=True)
+        out = np.maximum(out, np.abs(past @ present.T) / (n_samples - lag))
+    np.fill_diagonal(out, 0.0)
+    return out
+
+
+if NUMBA_AVAILABLE:
+    # 小规模数据上线程调度开销大于收益，按问题规模选择是否并行。
+    # numba的磁盘缓存键不含parallel标志，两个变体共用同一函数时会互相命中缓存，
+    # 因此并行变体不启用cache，避免加载到串行版本
+    _lagged_corr_screen_parallel = njit(parallel=True, fastmath=True)(_lagged_corr_screen)
+    _lagged_corr_screen = njit(cache=True, fastmath=True)(_lagged_corr_screen)
+
+
+def _opencl_gpu_available() -> bool:
+    """检测系统中是否存在可用的OpenCL GPU设备"""
+    if not OPENCL_AVAILABLE:
+        return False
+    try:
+        for platform in cl.get_platforms():
+            if platform.get_devices(device_type=cl.device_type.GPU):
+                return True
+    except cl.Error:
+        pass
+    return False
+
+
+def estimator_requires_java(estimator: str) -> bool:
+    """IDTxl中Jidt前缀的估计器通过JPype调用JIDT，需要Java环境"""
+    return estimator.startswith('Jidt')
+
+
+def _extract_correlated_pairs(C: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """提取上三角中|相关系数|不低于阈值的资产对，返回(行索引, 列索引, 相关系数)"""
+    n = C.shape[0]
+    capacity = n * (n - 1) // 2
+    rows = np.empty(capacity, dtype=np.int64)
+    cols = np.empty(capacity, dtype=np.int64)
+    vals = np.empty(capacity, dtype=np.float64)
+    count = 0
+    for i in range(n):
+        for j in range(i + 1, n):
+            if abs(C[i, j]) >= threshold:
+                rows[count] = i
+                cols[count] = j
+                vals[count] = C[i, j]
+                count += 1
+    return rows[:count], cols[:count], vals[:count]
+
+
+if NUMBA_AVAILABLE:
+    _extract_correlated_pairs = njit(cache=True, fastmath=True)(_extract_correlated_pairs)
+
+
+def _top_k_order(values: np.ndarray, k: int) -> np.ndarray:
+    """返回按values降序的下标：前k个用argpartition选出后排序，其余保持原顺序附在后面"""
+    n = values.size
+    if k >= n:
+        return np.argsort(-values, kind='stable')
+    top = np.argpartition(-values, k)[:k]
+    top = top[np.argsort(-values[top], kind='stable')]
+    rest = np.ones(n, dtype=bool)
+    rest[top] = False
+    return np.concatenate((top, np.flatnonzero(rest)))
+
+
+def _run_one_target(settings: Dict, data: Data, target: int, sources='all'):
+    """对单个目标节点执行多元传递熵分析（供并行工作进程调用）"""
+    network_analysis = MultivariateTE()
+    return network_analysis.analyse_single_target(
+        settings=settings,
+        data=data,
+        target=target,
+        sources=sources
+    )
+
+
+def _run_one_shard(tokens: List[str], base_config: Dict) -> Dict:
+    """在工作进程中对一个代币分片执行完整分析（模块级函数以便pickle）"""
+    analyzer = CryptoNetworkAnalyzer(base_config)
+    if not analyzer.fetch_and_preprocess_data(tokens):
+        return {}
+    if not analyzer.analyze_network():
+        return {}
+    return analyzer.identify_highly_correlated_assets()
+
+
 class HyperliquidDataFetcher:
     """Hyperliquid API数据获取器"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 16):
         self.base_url = "https://api.hyperliquid.xyz"
+        self.max_workers = max_workers  # 并发请求K线数据的线程数
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'CryptoNetworkAnalysis/1.0',
-            'Accept': 'application/json'
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
         })
+        
+        # 连接池复用长连接，并对限流和服务端错误自动重试（指数退避）
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST'])
+        )
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        self.session.mount('https://', adapter)
+    
+    @staticmethod
+    def _parse_json(response: requests.Response):
+        """解析响应JSON，优先使用orjson"""
+        if ORJSON_AVAILABLE:
+            return orjson.loads(response.content)
+        return response.json()
     
     def get_all_tokens(self) -> List[Dict]:
         """获取所有已上线的代币信息"""
@@ -64,7 +263,7 @@ class HyperliquidDataFetcher:
             response = self.session.get(url, timeout=30)
             response.raise_for_status()
             
-            data = response.json()
+            data = self._parse_json(response)
             tokens = data.get('universe', [])
             
             logger.info(f"成功获取 {len(tokens)} 个代币信息")
@@ -74,6 +273,29 @@ class HyperliquidDataFetcher:
             logger.error(f"获取代币信息失败: {e}")
             return []
     
+    def _fetch_one_coin(self, coin: str, start_time: int, end_time: int) -> Tuple[np.ndarray, np.ndarray]:
+        """获取单个代币的1小时K线数据，返回(时间戳, 收盘价)数组"""
+        url = f"{self.base_url}/info"
+        payload = {
+            'type': 'candleSnapshot',
+            'req': {
+                'coin': coin,
+                'interval': '1h',  # 1小时K线
+                'startTime': start_time,
+                'endTime': end_time
+            }
+        }
+        response = self.session.post(url, json=payload, timeout=60)
+        response.raise_for_status()
+        candles = self._parse_json(response)
+        
+        # 在工作线程内只提取时间戳和收盘价，开高低量等字段随响应一起释放，
+        # 不经过逐代币的DataFrame
+        n_candles = len(candles)
+        ts = np.fromiter((int(c['t']) for c in candles), dtype=np.int64, count=n_candles)
+        px = np.fromiter((float(c['c']) for c in candles), dtype=np.float64, count=n_candles)
+        return ts, px
+    
     def get_token_prices(self, tokens: List[str], hours: int = 24) -> pd.DataFrame:
         """获取代币价格数据"""
         try:
@@ -81,36 +303,45 @@ class HyperliquidDataFetcher:
             end_time = int(time.time() * 1000)  # 毫秒时间戳
             start_time = end_time - (hours * 60 * 60 * 1000)
             
-            url = f"{self.base_url}/info"
-            params = {
-                'type': 'candleSnapshot',
-                'coin': ','.join(tokens),
-                'interval': '1h',  # 1小时K线
-                'startTime': start_time,
-                'endTime': end_time
-            }
+            # candleSnapshot每次只接受一个代币，按代币并发请求以重叠网络往返时间
+            price_data = {}
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(self._fetch_one_coin, coin, start_time, end_time): coin
+                    for coin in tokens
+                }
+                for future in as_completed(futures):
+                    coin = futures[future]
+                    try:
+                        ts, px = future.result()
+                    except Exception as e:
+                        logger.warning(f"获取 {coin} 价格数据失败: {e}")
+                        continue
+                    
+                    if len(ts):
+                        price_data[coin] = (ts, px)
             
-            response = self.session.get(url, params=params, timeout=60)
-            response.raise_for_status()
+            if not price_data:
+                logger.error("未获取到任何代币的价格数据")
+                return pd.DataFrame()
             
-            data = response.json()
+            # 按所有代币共有的时间戳对齐（等价于合并后删除缺失值），按请求顺序排列列
+            coins = [coin for coin in tokens if coin in price_data]
+            common_ts = price_data[coins[0]][0]
+            for coin in coins[1:]:
+                common_ts = np.intersect1d(common_ts, price_data[coin][0])
             
-            # 处理价格数据
-            price_data = {}
-            for token_data in data:
-                coin = token_data['coin']
-                candles = token_data['candles']
-                
-                if candles:
-                    df = pd.DataFrame(candles)
-                    df['timestamp'] = pd.to_datetime(df['t'], unit='ms')
-                    df['price'] = df['c'].astype(float)  # 收盘价
-                    df = df.set_index('timestamp')
-                    price_data[coin] = df['price']
+            stacked_px = np.empty((len(common_ts), len(coins)), dtype=np.float64)
+            for k, coin in enumerate(coins):
+                ts, px = price_data[coin]
+                _, _, idx = np.intersect1d(common_ts, ts, return_indices=True)
+                stacked_px[:, k] = px[idx]
             
-            # 合并所有代币价格数据
-            price_df = pd.DataFrame(price_data)
-            price_df = price_df.dropna()  # 删除缺失值
+            price_df = pd.DataFrame(
+                data=stacked_px,
+                index=pd.to_datetime(common_ts, unit='ms'),
+                columns=coins
+            )
             
             logger.info(f"成功获取 {len(price_df.columns)} 个代币的 {len(price_df)} 小时价格数据")
             return price_df
@@ -124,12 +355,68 @@ class CryptoNetworkAnalyzer:
     """加密货币网络分析器 - 纯Python实现"""
     
     def __init__(self, config: Dict = None):
-        self.config = config or self._default_config()
-        self.data_fetcher = HyperliquidDataFetcher()
+        self.config = self._merge_config(config)
+        self.data_fetcher = HyperliquidDataFetcher(self.config.get('fetch_max_workers', 16))
         self.price_data = None
         self.network_results = None
+        self._corr_cache = None
+        self._price_matrix = None  # (assets, samples)格式的float32连续数组，分析的规范数据
+        self._asset_names = None  # 与self._price_matrix行顺序一致的资产名称
+        self._returns64 = None  # (对应的_price_matrix, float64收益率视图)，供相关性计算保持完整精度
+        self._data_standardised = False
+        self._fig = None  # 无图形界面时复用的Figure
+        self.cmi_estimator_used = None  # 实际使用的CMI估计器（可能因快速模式或GPU而不同于配置）
+        
+    @classmethod
+    def run_sharded(cls, token_lists: List[List[str]], base_config: Dict = None,
+                    max_workers: Optional[int] = None) -> List[Dict]:
+        """将代币集合分片，每个分片在独立进程中运行一个分析器，返回各分片的识别结果
+        
+        分片可以互不相交，也可以相互重叠以检测跨分片的连接；使用
+        union_shard_edges()合并各分片的边。CPU核心和并发请求数在各分片之间均分，
+        避免每个分片再各自开满并行工作进程和请求线程。
+        """
+        n_cpus = os.cpu_count() or 1
+        max_workers = max(1, min(max_workers or n_cpus, len(token_lists)))
+        shard_config = dict(base_config or {})
+        fetch_budget = shard_config.get('fetch_max_workers', cls._default_config()['fetch_max_workers'])
+        shard_config.update({
+            'num_threads': max(1, n_cpus // max_workers),
+            'fetch_max_workers': max(1, fetch_budget // max_workers),
+        })
         
-    def _default_config(self) -> Dict:
+        shard_results = [{} for _ in token_lists]
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_one_shard, tokens, shard_config): i
+                for i, tokens in enumerate(token_lists)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    shard_results[i] = future.result()
+                except Exception as e:
+                    logger.error(f"分片 {i} 分析失败: {e}")
+        return shard_results
+    
+    @staticmethod
+    def union_shard_edges(shard_results: List[Dict]) -> Dict:
+        """合并各分片的相关性资产对和传递熵连接（取并集，重复的边保留首次出现）"""
+        correlation_pairs = {}
+        te_connections = {}
+        for results in shard_results:
+            for pair in results.get('correlation_pairs', []):
+                key = frozenset((pair['asset1'], pair['asset2']))
+                correlation_pairs.setdefault(key, pair)
+            for conn in results.get('te_connections', []):
+                te_connections.setdefault((conn['source'], conn['target']), conn)
+        return {
+            'correlation_pairs': list(correlation_pairs.values()),
+            'te_connections': list(te_connections.values())
+        }
+    
+    @staticmethod
+    def _default_config() -> Dict:
         """默认配置 - 使用Python原生估计器"""
         return {
             'min_price': 0.001,  # 最小价格过滤
@@ -148,41 +435,119 @@ class CryptoNetworkAnalyzer:
             'fdr_alpha': 0.05,  # FDR显著性水平
             'correlation_threshold': 0.6,  # 降低相关性阈值
             'te_threshold': 0.05,  # 降低传递熵阈值
+            'ranked_pairs': 20,  # 按相关性强度排序的资产对数量（报告与图表只展示前若干个），其余不排序
             'kraskov_k': 4,  # Kraskov估计器参数
+            # PythonKraskovCMI的近邻搜索算法，None时自动选择：暴力搜索为O(T²)，
+            # 仅在安装numba且样本数不超过knn_bruteforce_max_samples时使用，否则使用KD树
+            'knn_finder': None,
+            'knn_bruteforce_max_samples': 2000,
             'num_threads': 'USE_ALL',  # 使用所有可用线程
+            'use_gpu': True,  # 检测到GPU时自动切换到OpenCLKraskovCMI
+            'gpuid': 0,  # OpenCL设备ID
+            'max_mem': None,  # GPU显存上限（字节），None时使用设备显存的90%
+            'fast_mode': False,  # 快速预览：使用高斯CMI估计器（需要Java环境）
+            'two_stage': False,  # 两阶段分析：先低滞后、少置换筛选候选源，再完整分析
+            'screening_max_lag_sources': 2,  # 筛选阶段最大源滞后
+            'screening_n_perm': 25,  # 筛选阶段置换次数（须大于1/alpha）
+            'screening_cache_dir': os.path.join(os.path.expanduser('~'), '.cache', 'idtxl'),
+            'price_cache_dir': '.cache',  # 原始价格数据缓存目录，None时不缓存
+            'price_cache_ttl': 3600,  # 价格缓存有效期（秒）
+            'prewhiten': False,  # 对收益率做AR(1)预白化，并缩小最大滞后
+            'prewhiten_max_lag_sources': 2,
+            'prewhiten_max_lag_target': 1,
+            'lag_corr_screening': False,  # 以滞后相关预筛选源-目标对，跳过明显独立的对
+            'lag_corr_threshold': 0.1,
+            'corr_prefilter': False,  # 以滞后相关性预过滤源-目标对
+            'corr_prefilter_threshold': 0.1,
+            'plot_dpi': 300,  # 可视化图片分辨率
+            'fetch_max_workers': 16,  # 并发请求K线数据的线程数（分片运行时为所有分片的总数）
+            'joblib_max_nbytes': '1M',  # 超过该大小的数组以内存映射方式共享给并行工作进程
         }
     
-    def fetch_and_preprocess_data(self) -> bool:
-        """获取并预处理数据"""
+    def _merge_config(self, config: Optional[Dict]) -> Dict:
+        """构造时一次性将自定义配置合并到默认配置并校验
+        
+        支持扁平配置，也支持配置文件中按'data_processing'、'network_analysis'等分节的嵌套配置
+        """
+        merged = self._default_config()
+        for key, value in (config or {}).items():
+            if isinstance(value, dict) and key not in merged:
+                merged.update(value)
+            else:
+                merged[key] = value
+        self._validate_config(merged)
+        return merged
+    
+    @staticmethod
+    def _validate_config(config: Dict):
+        """校验配置取值，发现无效参数时抛出ValueError"""
+        errors = []
+        invalid = set()
+        for key in ('max_tokens', 'time_hours', 'max_lag_sources', 'max_lag_target',
+                    'kraskov_k', 'n_perm_max_stat', 'n_perm_min_stat', 'n_perm_omnibus'):
+            value = config.get(key)
+            if not isinstance(value, (int, np.integer)) or isinstance(value, bool) or value < 1:
+                errors.append(f"{key}必须为正整数，当前为{value!r}")
+                invalid.add(key)
+        min_lag = config.get('min_lag_sources')
+        # max_lag_sources本身无效时只检查min_lag_sources为正，避免与非法类型比较
+        max_lag = min_lag if 'max_lag_sources' in invalid else config.get('max_lag_sources', min_lag)
+        if (not isinstance(min_lag, (int, np.integer)) or isinstance(min_lag, bool) or
+                not 0 < min_lag <= max_lag):
+            errors.append(f"min_lag_sources必须在1到max_lag_sources之间，当前为{min_lag!r}")
+        for key in ('correlation_threshold', 'te_threshold'):
+            value = config.get(key)
+            if not isinstance(value, (int, float)) or not 0 <= value <= 1:
+                errors.append(f"{key}必须在[0, 1]之间，当前为{value!r}")
+        alpha = config.get('fdr_alpha')
+        if not isinstance(alpha, (int, float)) or not 0 < alpha < 1:
+            errors.append(f"fdr_alpha必须在(0, 1)之间，当前为{alpha!r}")
+        if errors:
+            raise ValueError("配置无效: " + "; ".join(errors))
+    
+    def fetch_and_preprocess_data(self, tokens: Optional[List[str]] = None) -> bool:
+        """获取并预处理数据，指定tokens时跳过代币筛选直接分析这些代币"""
         try:
             logger.info("开始获取加密货币数据...")
             
-            # 获取所有代币
-            tokens_info = self.data_fetcher.get_all_tokens()
-            if not tokens_info:
-                logger.error("无法获取代币信息")
-                return False
+            # 网络请求期间CPU空闲，在后台线程中提前编译numba内核
+            self._start_kernel_warmup()
             
-            # 过滤代币
-            filtered_tokens = self._filter_tokens(tokens_info)
+            if tokens is not None:
+                filtered_tokens = list(tokens)
+            else:
+                # 获取所有代币
+                tokens_info = self.data_fetcher.get_all_tokens()
+                if not tokens_info:
+                    logger.error("无法获取代币信息")
+                    return False
+                
+                # 过滤代币
+                filtered_tokens = self._filter_tokens(tokens_info)
             if not filtered_tokens:
                 logger.error("没有符合条件的代币")
                 return False
             
             logger.info(f"选择 {len(filtered_tokens)} 个代币进行分析")
             
-            # 获取价格数据
-            self.price_data = self.data_fetcher.get_token_prices(
-                filtered_tokens, 
-                self.config['time_hours']
-            )
-            
-            if self.price_data.empty:
-                logger.error("无法获取价格数据")
-                return False
+            # 获取价格数据（优先读取本地缓存）
+            cache_path = self._price_cache_path(filtered_tokens)
+            self.price_data = self._load_price_cache(cache_path)
+            if self.price_data is None:
+                self.price_data = self.data_fetcher.get_token_prices(
+                    filtered_tokens, 
+                    self.config['time_hours']
+                )
+                
+                if self.price_data.empty:
+                    logger.error("无法获取价格数据")
+                    return False
+                
+                self._save_price_cache(cache_path)
             
             # 数据预处理
-            self._preprocess_data()
+            if not self._preprocess_data():
+                return False
             
             logger.info(f"数据预处理完成，最终数据形状: {self.price_data.shape}")
             return True
@@ -191,6 +556,66 @@ class CryptoNetworkAnalyzer:
             logger.error(f"数据获取和预处理失败: {e}")
             return False
     
+    def _start_kernel_warmup(self):
+        """启动后台线程编译numba内核，与数据获取的网络I/O重叠"""
+        if not NUMBA_AVAILABLE:
+            return
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(self._warmup_kernels)
+        executor.shutdown(wait=False)
+    
+    def _warmup_kernels(self):
+        """以小规模输入调用分析中会用到的numba内核，编译结果写入磁盘缓存供并行工作进程加载"""
+        try:
+            X = np.ascontiguousarray(np.random.default_rng(0).standard_normal((2, 16)))
+            _extract_correlated_pairs(np.corrcoef(X), 0.5)
+            if self.config.get('corr_prefilter', False) or self.config.get('lag_corr_screening', False):
+                _lagged_corr_screen(X, 1, 2)
+                _lagged_corr_screen_parallel(X, 1, 2)
+            if (self.config.get('cmi_estimator') == 'PythonKraskovCMI' and
+                    self.config.get('knn_finder') in (None, 'numba_bruteforce')):
+                # PythonKraskovCMI只调用融合的近邻计数内核
+                from idtxl.knn.knn_finder_numba import chebyshev_cmi_counts
+                points = np.ascontiguousarray(X.T)
+                chebyshev_cmi_counts(points, points, points, 2)
+            logger.debug("numba内核预编译完成")
+        except Exception as e:
+            logger.warning(f"numba内核预编译失败: {e}")
+    
+    def _price_cache_path(self, tokens: List[str]) -> Optional[str]:
+        """价格缓存文件路径，按代币集合和取整到小时的时间窗口生成键；未启用缓存或没有parquet引擎时返回None"""
+        cache_dir = self.config.get('price_cache_dir')
+        if not cache_dir or not PARQUET_AVAILABLE:
+            return None
+        end_hour = int(time.time() // 3600)
+        start_hour = end_hour - self.config['time_hours']
+        key = hashlib.md5(f"{sorted(tokens)}_{start_hour}_{end_hour}".encode()).hexdigest()
+        return os.path.join(cache_dir, f'prices_{key}.parquet')
+    
+    def _load_price_cache(self, cache_path: Optional[str]) -> Optional[pd.DataFrame]:
+        """读取未过期的价格缓存，不可用时返回None"""
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        if time.time() - os.path.getmtime(cache_path) >= self.config.get('price_cache_ttl', 3600):
+            return None
+        try:
+            price_df = pd.read_parquet(cache_path)
+        except Exception as e:  # 文件损坏
+            logger.warning(f"读取价格缓存失败: {e}")
+            return None
+        logger.info(f"使用缓存的价格数据: {cache_path}")
+        return price_df
+    
+    def _save_price_cache(self, cache_path: Optional[str]):
+        """将原始价格数据写入parquet缓存"""
+        if not cache_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            self.price_data.to_parquet(cache_path, compression='zstd')
+        except Exception as e:  # 磁盘不可写或压缩编码不可用时跳过缓存
+            logger.warning(f"写入价格缓存失败: {e}")
+    
     def _filter_tokens(self, tokens_info: List[Dict]) -> List[str]:
         """过滤代币"""
         filtered = []
@@ -208,20 +633,104 @@ class CryptoNetworkAnalyzer:
         
         return filtered
     
-    def _preprocess_data(self):
-        """数据预处理"""
+    def _preprocess_data(self) -> bool:
+        """数据预处理，无可用数据时返回False"""
+        X = self.price_data.values.astype(np.float64, copy=False)
+        columns = self.price_data.columns
+        
         # 计算收益率
-        returns = self.price_data.pct_change().dropna()
+        R = X[1:] / X[:-1] - 1.0
+        index = self.price_data.index[1:]
         
-        # 移除异常值（超过3个标准差）
-        returns = returns[np.abs(returns) < 3 * returns.std()]
+        # 剔除收益率恒定（无波动或无成交）或含非有限值的资产，否则标准化会产生NaN
+        sd = R.std(axis=0, ddof=1)
+        keep = np.isfinite(R).all(axis=0) & np.isfinite(sd) & (sd > 0)
+        if not keep.all():
+            logger.warning(f"剔除收益率无波动或无效的资产: {list(columns[~keep])}")
+            R, columns = R[:, keep], columns[keep]
+        if R.shape[1] == 0 or R.shape[0] < 2:
+            logger.error(f"预处理后没有可用数据（{R.shape[0]}个时间点，{R.shape[1]}个资产）")
+            return False
+        
+        # 异常值缩尾：将偏离均值超过3个标准差的收益率截断到边界。不删除时间点，
+        # 以保证滞后嵌入（传递熵、AR(1)预白化）中相邻样本在时间上确实相邻
+        mu = R.mean(axis=0)
+        sd = R.std(axis=0, ddof=1)
+        n_clipped = int((np.abs(R - mu) > 3.0 * sd).sum())
+        R = np.clip(R, mu - 3.0 * sd, mu + 3.0 * sd)
+        if n_clipped:
+            logger.info(f"缩尾处理了 {n_clipped} 个超过3个标准差的收益率")
         
         # 标准化数据
-        returns = (returns - returns.mean()) / returns.std()
+        R = (R - R.mean(axis=0)) / R.std(axis=0, ddof=1)
+        
+        if self.config.get('prewhiten', False):
+            R, index = self._prewhiten(R, index, columns)
         
+        returns = pd.DataFrame(
+            R,
+            index=index,
+            columns=columns
+        )
         self.price_data = returns
+        self._set_price_matrix(returns, standardised=True)
         
-        logger.info("数据预处理完成：计算收益率、移除异常值、标准化")
+        logger.info("数据预处理完成：计算收益率、异常值缩尾、标准化")
+        return True
+    
+    def _prewhiten(self, R: np.ndarray, index: pd.Index, columns: pd.Index) -> Tuple[np.ndarray, pd.Index]:
+        """AR(1)预白化：r_t - φ·r_{t-1}，去除自相关后可使用更小的最大滞后"""
+        phi = (R[:-1] * R[1:]).sum(axis=0) / (R[:-1] ** 2).sum(axis=0)
+        for asset, phi_i in zip(columns, phi):
+            logger.info(f"AR(1)系数 φ[{asset}] = {phi_i:.4f}")
+        
+        R = R[1:] - phi * R[:-1]
+        R = (R - R.mean(axis=0)) / R.std(axis=0, ddof=1)
+        
+        # 传递熵计算量随最大滞后线性增长，预白化后缩小搜索深度
+        self.config['max_lag_sources'] = min(self.config['max_lag_sources'],
+                                             self.config.get('prewhiten_max_lag_sources', 2))
+        self.config['max_lag_target'] = min(self.config['max_lag_target'],
+                                            self.config.get('prewhiten_max_lag_target', 1))
+        self.config['min_lag_sources'] = min(self.config['min_lag_sources'],
+                                             self.config['max_lag_sources'])
+        logger.info(f"预白化完成：max_lag_sources={self.config['max_lag_sources']}, "
+                    f"max_lag_target={self.config['max_lag_target']}")
+        return R, index[1:]
+    
+    def _ensure_price_matrix(self):
+        """确保(assets, samples)价格矩阵可用；也可由调用方直接设置_price_matrix和_asset_names"""
+        if self._price_matrix is None:
+            # 数据未经预处理（如外部直接赋值price_data），由IDTxl负责标准化
+            self._set_price_matrix(self.price_data, standardised=False)
+    
+    def _set_price_matrix(self, frame: pd.DataFrame, standardised: bool):
+        """一次性转换为(assets, samples)格式float32连续数组，DataFrame仅保留用于报告"""
+        self._price_matrix = np.ascontiguousarray(frame.values.T, dtype=np.float32)
+        self._returns64 = (self._price_matrix, frame.to_numpy(dtype=np.float64, copy=False).T)
+        self._asset_names = frame.columns.tolist()
+        self._data_standardised = standardised
+        self._corr_cache = None
+    
+    def persist_price_matrix(self, path: str) -> bool:
+        """将(assets, samples)价格矩阵写入.npy文件，并以只读内存映射方式重新打开
+        
+        之后的相关性计算、可视化以及joblib并行工作进程共享页缓存中的同一份数据，
+        而不是各自在堆内持有副本
+        """
+        try:
+            self._ensure_price_matrix()
+            np.save(path, self._price_matrix)
+            paired = self._returns64 is not None and self._returns64[0] is self._price_matrix
+            self._price_matrix = np.load(path, mmap_mode='r')
+            if paired:
+                self._returns64 = (self._price_matrix, self._returns64[1])
+            self._corr_cache = None
+            logger.info(f"价格矩阵已写入并内存映射: {path}")
+            return True
+        except Exception as e:
+            logger.error(f"价格矩阵持久化失败: {e}")
+            return False
     
     def analyze_network(self) -> bool:
         """执行网络分析 - 使用Python原生估计器"""
@@ -229,8 +738,12 @@ class CryptoNetworkAnalyzer:
             logger.info("开始网络分析（使用Python原生估计器）...")
             
             # 准备IDTxl数据格式
-            data_array = self.price_data.values.T  # 转置为(processes, samples)格式
-            data = Data(data_array, dim_order='ps')
+            self._ensure_price_matrix()
+            data = Data(
+                self._price_matrix,
+                dim_order='ps',
+                normalise=not self._data_standardised
+            )
             
             # 配置分析参数 - 使用Python原生估计器
             settings = {
@@ -247,14 +760,28 @@ class CryptoNetworkAnalyzer:
                 'kraskov_k': self.config['kraskov_k'],
                 'num_threads': self.config['num_threads'],
             }
+            if settings['cmi_estimator'] == 'PythonKraskovCMI':
+                settings['knn_finder'] = self._select_knn_finder()
+            self._select_cmi_estimator(settings)
             
             # 执行多元传递熵分析
-            logger.info("执行多元传递熵分析...")
-            network_analysis = MultivariateTE()
-            self.network_results = network_analysis.analyse_network(
-                settings=settings, 
-                data=data
-            )
+            candidates = None
+            if self.config.get('corr_prefilter', False) or self.config.get('lag_corr_screening', False):
+                strength = self._lagged_corr_strength(settings)
+                if self.config.get('corr_prefilter', False):
+                    candidates = self._prefilter_by_correlation(strength)
+                if self.config.get('lag_corr_screening', False):
+                    candidates = self._intersect_candidates(
+                        candidates, self._screen_lagged_correlation(strength)
+                    )
+            if self.config.get('two_stage', False):
+                candidates = self._screen_candidate_sources(settings, data, candidates)
+            if candidates is not None:
+                logger.info("执行多元传递熵分析（仅检验筛选出的候选源）...")
+                self.network_results = self._run_te_analysis(settings, data, candidates)
+            else:
+                logger.info("执行多元传递熵分析...")
+                self.network_results = self._run_te_analysis(settings, data)
             
             logger.info("网络分析完成")
             return True
@@ -263,37 +790,246 @@ class CryptoNetworkAnalyzer:
             logger.error(f"网络分析失败: {e}")
             return False
     
+    def _select_knn_finder(self) -> str:
+        """选择近邻搜索算法：未指定时按样本数在numba暴力搜索与KD树之间选择"""
+        knn_finder = self.config.get('knn_finder')
+        if knn_finder is not None:
+            return knn_finder
+        n_samples = self._price_matrix.shape[1]
+        if NUMBA_AVAILABLE and n_samples <= self.config.get('knn_bruteforce_max_samples', 2000):
+            return 'numba_bruteforce'
+        return 'scipy_kdtree'
+    
+    def _select_cmi_estimator(self, settings: Dict):
+        """选择CMI估计器：快速预览模式使用高斯估计器，检测到GPU时使用OpenCL版Kraskov估计器"""
+        if self.config.get('fast_mode', False):
+            # 高斯估计器每次CMI计算为O(T)的协方差行列式运算，且在按时间置换时
+            # 由解析零分布生成替代数据，无需kNN搜索。
+            # 注意：传递熵数值只能在同一估计器的结果之间比较。
+            settings['cmi_estimator'] = 'JidtGaussianCMI'
+        elif (settings['cmi_estimator'] == 'PythonKraskovCMI' and
+                self.config.get('use_gpu', True) and _opencl_gpu_available()):
+            settings['cmi_estimator'] = 'OpenCLKraskovCMI'
+            settings['gpuid'] = self.config.get('gpuid', 0)
+            # 限制显存用量，IDTxl会据此分批计算置换检验的替代数据
+            if self.config.get('max_mem') is not None:
+                settings['max_mem'] = self.config['max_mem']
+        self.cmi_estimator_used = settings['cmi_estimator']
+        logger.info(f"使用CMI估计器: {settings['cmi_estimator']}")
+    
+    def _run_te_analysis(self, settings: Dict, data: Data,
+                         sources: Optional[Dict[int, List[int]]] = None) -> Optional[ResultsNetworkInference]:
+        """执行多元传递熵分析，sources为{目标: 候选源列表}，None时检验所有节点"""
+        if sources is None:
+            targets = list(range(data.n_processes))
+            target_sources = ['all' for _ in targets]
+        else:
+            targets = [t for t in sorted(sources) if sources[t]]
+            target_sources = [sources[t] for t in targets]
+        if not targets:
+            logger.info("没有需要检验的目标节点")
+            return None
+        
+        if JOBLIB_AVAILABLE:
+            return self._analyse_targets_parallel(settings, data, targets, target_sources)
+        network_analysis = MultivariateTE()
+        return network_analysis.analyse_network(
+            settings=settings, 
+            data=data,
+            targets=targets,
+            sources='all' if sources is None else target_sources
+        )
+    
+    def _prefilter_by_correlation(self, strength: np.ndarray) -> Dict[int, List[int]]:
+        """相关性预过滤：各滞后上|相关系数|都很小的资产对传递熵几乎不会超过阈值，不作为候选源
+        
+        使用滞后相关而非同期相关，纯滞后耦合（同期不相关）正是传递熵要检出的连接
+        """
+        n_processes = strength.shape[0]
+        threshold = self.config.get('corr_prefilter_threshold', 0.1)
+        candidates = {
+            t: np.flatnonzero(strength[:, t] > threshold).tolist()
+            for t in range(n_processes)
+        }
+        logger.info(f"相关性预过滤完成：保留 {sum(len(v) for v in candidates.values())}/"
+                    f"{n_processes * (n_processes - 1)} 个源-目标对")
+        return candidates
+    
+    @staticmethod
+    def _intersect_candidates(a: Optional[Dict[int, List[int]]],
+                              b: Dict[int, List[int]]) -> Dict[int, List[int]]:
+        """取两组候选源的交集，a为None时直接返回b"""
+        if a is None:
+            return b
+        candidates = {}
+        for t in b:
+            allowed = set(a.get(t, []))
+            candidates[t] = [s for s in b[t] if s in allowed]
+        return candidates
+    
+    def _lagged_corr_strength(self, settings: Dict) -> np.ndarray:
+        """计算源滞后min_lag..max_lag上的最大|相关系数|，返回矩阵[源, 目标]"""
+        X = np.ascontiguousarray(self._price_matrix, dtype=np.float64)
+        n_processes, n_samples = X.shape
+        min_lag = settings['min_lag_sources']
+        max_lag = settings['max_lag_sources']
+        if not NUMBA_AVAILABLE:
+            return _lagged_corr_screen_numpy(X, min_lag, max_lag)
+        if n_samples * n_processes * n_processes > 1e6:
+            return _lagged_corr_screen_parallel(X, min_lag, max_lag)
+        return _lagged_corr_screen(X, min_lag, max_lag)
+    
+    def _screen_lagged_correlation(self, strength: np.ndarray) -> Dict[int, List[int]]:
+        """预筛选：仅保留滞后相关性超过阈值的源-目标对，交给Kraskov CMI做完整检验"""
+        n_processes = strength.shape[0]
+        threshold = self.config.get('lag_corr_threshold', 0.1)
+        candidates = {
+            t: np.flatnonzero(strength[:, t] >= threshold).tolist()
+            for t in range(n_processes)
+        }
+        logger.info(f"滞后相关预筛选完成：保留 {sum(len(v) for v in candidates.values())}/"
+                    f"{n_processes * (n_processes - 1)} 个源-目标对")
+        return candidates
+    
+    def _screen_candidate_sources(self, settings: Dict, data: Data,
+                                  sources: Optional[Dict[int, List[int]]] = None) -> Dict[int, List[int]]:
+        """筛选阶段：以较小滞后和置换次数找出每个目标的候选源，结果按数据和设置缓存到磁盘"""
+        n_perm = self.config.get('screening_n_perm', 25)
+        max_lag = min(self.config.get('screening_max_lag_sources', 2), settings['max_lag_sources'])
+        screen_settings = dict(
+            settings,
+            max_lag_sources=max_lag,
+            min_lag_sources=min(settings['min_lag_sources'], max_lag),
+            n_perm_max_stat=n_perm,
+            n_perm_min_stat=n_perm,
+            n_perm_omnibus=n_perm,
+            fdr_correction=False
+        )
+        
+        # 缓存键：数据内容 + 影响筛选结果的设置
+        config_subset = {k: v for k, v in screen_settings.items() if k not in ('num_threads', 'verbose')}
+        config_subset['normalise'] = data.normalise
+        config_subset['sources'] = sources
+        key = hashlib.md5(
+            self._price_matrix.tobytes() + json.dumps(config_subset, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        cache_dir = self.config.get('screening_cache_dir')
+        cache_path = os.path.join(cache_dir, f'screening_{key}.p') if cache_dir else None
+        
+        if cache_path and os.path.exists(cache_path):
+            logger.info(f"使用缓存的筛选结果: {cache_path}")
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        
+        logger.info(f"筛选候选源（max_lag_sources={max_lag}, n_perm={n_perm}）...")
+        results = self._run_te_analysis(screen_settings, data, sources)
+        if results is None:
+            return {}
+        candidates = {
+            t: results.get_target_sources(t, fdr=False).tolist()
+            for t in results.targets_analysed
+        }
+        logger.info(f"筛选完成：共 {sum(len(v) for v in candidates.values())} 个候选源-目标对")
+        
+        if cache_path:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(candidates, f)
+        return candidates
+    
+    def _analyse_targets_parallel(self, settings: Dict, data: Data, targets: List[int],
+                                  sources: List) -> ResultsNetworkInference:
+        """按目标节点并行执行传递熵分析，并合并为网络结果"""
+        settings.setdefault('verbose', True)
+        settings.setdefault('fdr_correction', True)
+        
+        # 各目标节点之间相互独立，可分发到不同进程。超过max_nbytes的数组（Data对象
+        # 内部的数据数组）由joblib写入临时文件并以只读内存映射传给工作进程，
+        # 所有进程共享同一份物理页面而不是各自反序列化一份副本
+        n_jobs = self.config['num_threads'] if isinstance(self.config['num_threads'], int) else -1
+        if n_jobs != 1:
+            # 并行度已由目标节点提供，每个工作进程内的估计器只用单线程，避免线程超额订阅
+            settings['num_threads'] = 1
+        per_target_results = Parallel(
+            n_jobs=n_jobs,
+            backend='loky',
+            batch_size=1,
+            max_nbytes=self.config.get('joblib_max_nbytes', '1M'),
+            mmap_mode='r'
+        )(
+            delayed(_run_one_target)(settings, data, t, s) for t, s in zip(targets, sources)
+        )
+        
+        # 与MultivariateTE.analyse_network一致：合并单目标结果后在网络层面做FDR校正
+        results = ResultsNetworkInference(
+            n_nodes=data.n_processes,
+            n_realisations=data.n_realisations(),
+            normalised=data.normalise
+        )
+        results.combine_results(*per_target_results)
+        results.data_properties.n_realisations = (
+            per_target_results[-1].data_properties.n_realisations
+        )
+        if settings['fdr_correction']:
+            results = network_fdr(settings, results)
+        return results
+    
+    def _get_corr(self) -> np.ndarray:
+        """获取相关性矩阵（行列顺序与self._asset_names一致），按价格矩阵缓存以避免重复计算"""
+        self._ensure_price_matrix()
+        # 缓存中持有矩阵本身并按对象身份比较：id()在对象回收后会被复用，可能命中其他矩阵的结果
+        if self._corr_cache is not None and self._corr_cache[0] is self._price_matrix:
+            return self._corr_cache[1]
+        
+        # 按(assets, samples)布局一次BLAS调用完成；有对应的float64收益率时用其计算，
+        # 避免相关系数带上float32舍入误差，仅直接设置了_price_matrix时退回float32矩阵
+        source = self._price_matrix
+        if self._returns64 is not None and self._returns64[0] is self._price_matrix:
+            source = self._returns64[1]
+        correlation_matrix = np.corrcoef(source)
+        self._corr_cache = (self._price_matrix, correlation_matrix)
+        return correlation_matrix
+    
     def analyze_correlation_network(self) -> Dict:
         """基于相关性的网络分析 - 作为传递熵的补充"""
         try:
             logger.info("执行相关性网络分析...")
             
             # 计算相关性矩阵
-            correlation_matrix = self.price_data.corr()
-            
-            # 识别高度相关的资产对
-            highly_correlated = []
-            for i in range(len(correlation_matrix.columns)):
-                for j in range(i+1, len(correlation_matrix.columns)):
-                    corr = correlation_matrix.iloc[i, j]
-                    if abs(corr) >= self.config['correlation_threshold']:
-                        asset1 = correlation_matrix.columns[i]
-                        asset2 = correlation_matrix.columns[j]
-                        highly_correlated.append({
-                            'asset1': asset1,
-                            'asset2': asset2,
-                            'correlation': corr,
-                            'abs_correlation': abs(corr)
-                        })
+            correlation_matrix = self._get_corr()
+            
+            # 识别高度相关的资产对：可用时使用numba编译的循环，否则使用上三角索引 + 阈值掩码
+            C = correlation_matrix
+            labels = self._asset_names
+            threshold = self.config['correlation_threshold']
+            if NUMBA_AVAILABLE:
+                iu, ju, vals = _extract_correlated_pairs(
+                    np.ascontiguousarray(C, dtype=np.float64), float(threshold)
+                )
+            else:
+                iu, ju = np.triu_indices(C.shape[0], k=1)
+                vals = C[iu, ju]
+                mask = np.abs(vals) >= threshold
+                iu, ju, vals = iu[mask], ju[mask], vals[mask]
             
-            # 按相关性强度排序
-            highly_correlated.sort(key=lambda x: x['abs_correlation'], reverse=True)
+            # 按相关性强度只对前ranked_pairs个资产对排序，避免对全部资产对做完整排序
+            order = _top_k_order(np.abs(vals), self.config.get('ranked_pairs', 20))
+            highly_correlated = [
+                {
+                    'asset1': labels[iu[k]],
+                    'asset2': labels[ju[k]],
+                    'correlation': float(vals[k]),
+                    'abs_correlation': abs(float(vals[k]))
+                }
+                for k in order
+            ]
             
             # 基于相关性构建网络
             correlation_network = {
                 'correlation_matrix': correlation_matrix,
+                'labels': labels,
                 'highly_correlated_pairs': highly_correlated,
-                'network_density': len(highly_correlated) / (len(correlation_matrix.columns) * (len(correlation_matrix.columns) - 1) / 2)
+                'network_density': len(highly_correlated) / (C.shape[0] * (C.shape[0] - 1) / 2)
             }
             
             logger.info(f"相关性分析完成：发现 {len(highly_correlated)} 个高相关对")
@@ -315,14 +1051,16 @@ class CryptoNetworkAnalyzer:
                 for edge in edge_list:
                     if edge[2] >= self.config['te_threshold']:  # 传递熵阈值
                         te_connections.append({
-                            'source': self.price_data.columns[edge[0]],
-                            'target': self.price_data.columns[edge[1]],
+                            'source': self._asset_names[edge[0]],
+                            'target': self._asset_names[edge[1]],
                             'transfer_entropy': edge[2],
                             'p_value': edge[3] if len(edge) > 3 else None
                         })
                 
-                # 按传递熵强度排序
-                te_connections.sort(key=lambda x: x['transfer_entropy'], reverse=True)
+                # 按传递熵强度排序（NumPy argsort，避免逐元素调用Python排序键）
+                te_vals = np.array([c['transfer_entropy'] for c in te_connections], dtype=np.float64)
+                order = np.argsort(-te_vals, kind='stable')
+                te_connections = [te_connections[i] for i in order]
             
             # 执行相关性分析
             correlation_network = self.analyze_correlation_network()
@@ -340,11 +1078,12 @@ class CryptoNetworkAnalyzer:
                 'asset_combinations': asset_combinations,
                 'correlation_network': correlation_network,
                 'summary': {
-                    'total_assets': len(self.price_data.columns),
+                    'total_assets': len(self._asset_names),
                     'highly_correlated_pairs': len(highly_correlated),
                     'te_connections': len(te_connections),
                     'asset_combinations': len(asset_combinations),
-                    'network_density': correlation_network.get('network_density', 0)
+                    'network_density': correlation_network.get('network_density', 0),
+                    'cmi_estimator': self.cmi_estimator_used or self.config['cmi_estimator']
                 }
             }
             
@@ -359,64 +1098,49 @@ class CryptoNetworkAnalyzer:
         """寻找资产组合"""
         combinations = []
         
-        # 基于相关性的组合
-        asset_groups = {}
-        for pair in correlated_pairs:
-            asset1, asset2 = pair['asset1'], pair['asset2']
-            
-            # 寻找现有组
-            found_group = None
-            for group_id, group in asset_groups.items():
-                if asset1 in group or asset2 in group:
-                    found_group = group_id
-                    break
-            
-            if found_group is not None:
-                asset_groups[found_group].update([asset1, asset2])
-            else:
-                new_group_id = len(asset_groups)
-                asset_groups[new_group_id] = {asset1, asset2}
-        
-        # 转换为列表格式
-        for group_id, group in asset_groups.items():
-            if len(group) >= 2:  # 至少2个资产
-                combinations.append({
-                    'type': 'correlation_based',
-                    'assets': list(group),
-                    'size': len(group),
-                    'strength': 'high' if len(group) >= 3 else 'medium'
-                })
-        
-        # 基于传递熵的组合
-        te_groups = {}
-        for conn in te_connections:
-            source, target = conn['source'], conn['target']
-            
-            # 寻找现有组
-            found_group = None
-            for group_id, group in te_groups.items():
-                if source in group or target in group:
-                    found_group = group_id
-                    break
-            
-            if found_group is not None:
-                te_groups[found_group].update([source, target])
-            else:
-                new_group_id = len(te_groups)
-                te_groups[new_group_id] = {source, target}
-        
-        # 添加TE组合
-        for group_id, group in te_groups.items():
-            if len(group) >= 2:
-                combinations.append({
-                    'type': 'te_based',
-                    'assets': list(group),
-                    'size': len(group),
-                    'strength': 'high' if len(group) >= 3 else 'medium'
-                })
+        # 基于相关性的组合（无向图连通分量）
+        correlation_edges = [(p['asset1'], p['asset2']) for p in correlated_pairs]
+        for group in self._connected_asset_groups(correlation_edges, directed=False):
+            combinations.append({
+                'type': 'correlation_based',
+                'assets': group,
+                'size': len(group),
+                'strength': 'high' if len(group) >= 3 else 'medium'
+            })
+        
+        # 基于传递熵的组合（有向图弱连通分量）
+        te_edges = [(c['source'], c['target']) for c in te_connections]
+        for group in self._connected_asset_groups(te_edges, directed=True):
+            combinations.append({
+                'type': 'te_based',
+                'assets': group,
+                'size': len(group),
+                'strength': 'high' if len(group) >= 3 else 'medium'
+            })
         
         return combinations
     
+    def _connected_asset_groups(self, edges: List[Tuple[str, str]], directed: bool) -> List[List[str]]:
+        """按连通分量对资产分组，返回至少包含2个资产的组"""
+        if not edges:
+            return []
+        
+        # 资产名称按数据列顺序映射为int32 ID，构建稀疏邻接矩阵
+        asset_to_id = {asset: i for i, asset in enumerate(self._asset_names)}
+        n_assets = len(asset_to_id)
+        n_edges = len(edges)
+        row = np.fromiter((asset_to_id[a1] for a1, _ in edges), dtype=np.int32, count=n_edges)
+        col = np.fromiter((asset_to_id[a2] for _, a2 in edges), dtype=np.int32, count=n_edges)
+        graph = csr_matrix((np.ones(n_edges, dtype=np.int8), (row, col)), shape=(n_assets, n_assets))
+        
+        # 无连接的资产各自构成单元素分量，按分量大小过滤即可
+        n_components, labels = connected_components(graph, directed=directed, connection='weak')
+        sizes = np.bincount(labels, minlength=n_components)
+        groups = [[] for _ in range(n_components)]
+        for idx in np.flatnonzero(sizes[labels] >= 2):
+            groups[labels[idx]].append(self._asset_names[idx])
+        return [group for group in groups if group]
+    
     def visualize_results(self, results: Dict, save_path: str = None):
         """可视化结果"""
         try:
@@ -424,18 +1148,28 @@ class CryptoNetworkAnalyzer:
             
             # 设置图形样式
             plt.style.use('seaborn-v0_8')
-            fig = plt.figure(figsize=(20, 15))
+            fig = self._get_figure()
+            ax1, ax2, ax3, ax4, ax5, ax6 = fig.subplots(2, 3).ravel()
             
             # 1. 相关性热力图
-            ax1 = plt.subplot(2, 3, 1)
-            correlation_matrix = results.get('correlation_network', {}).get('correlation_matrix', self.price_data.corr())
-            sns.heatmap(correlation_matrix, annot=False, cmap='coolwarm', center=0, ax=ax1)
+            correlation_network = results.get('correlation_network', {})
+            correlation_matrix = correlation_network.get('correlation_matrix')
+            labels = correlation_network.get('labels')
+            if correlation_matrix is None:
+                correlation_matrix = self._get_corr()
+                labels = self._asset_names
+            # imshow只生成单个AxesImage对象，代替逐单元格绘制的热力图
+            im = ax1.imshow(correlation_matrix, cmap='coolwarm', vmin=-1, vmax=1, aspect='auto')
+            fig.colorbar(im, ax=ax1)
+            ax1.set_xticks(range(len(labels)))
+            ax1.set_xticklabels(labels, rotation=90)
+            ax1.set_yticks(range(len(labels)))
+            ax1.set_yticklabels(labels)
             ax1.set_title('资产相关性热力图', fontsize=14, fontweight='bold')
             ax1.set_xlabel('资产')
             ax1.set_ylabel('资产')
             
             # 2. 网络图（如果有传递熵结果）
-            ax2 = plt.subplot(2, 3, 2)
             if self.network_results:
                 try:
                     plot_network(
@@ -454,7 +1188,6 @@ class CryptoNetworkAnalyzer:
                 ax2.set_title('传递熵网络图（不可用）', fontsize=14, fontweight='bold')
             
             # 3. 高相关资产对
-            ax3 = plt.subplot(2, 3, 3)
             if results.get('correlation_pairs'):
                 pairs = results['correlation_pairs'][:10]  # 前10个
                 assets = [f"{p['asset1']}-{p['asset2']}" for p in pairs]
@@ -472,7 +1205,6 @@ class CryptoNetworkAnalyzer:
                             f'{width:.3f}', ha='left', va='center')
             
             # 4. 传递熵连接
-            ax4 = plt.subplot(2, 3, 4)
             if results.get('te_connections'):
                 connections = results['te_connections'][:10]  # 前10个
                 connections_str = [f"{c['source']}→{c['target']}" for c in connections]
@@ -493,7 +1225,6 @@ class CryptoNetworkAnalyzer:
                 ax4.set_title('传递熵连接（无数据）', fontsize=14, fontweight='bold')
             
             # 5. 资产组合分布
-            ax5 = plt.subplot(2, 3, 5)
             if results.get('asset_combinations'):
                 combinations = results['asset_combinations']
                 types = [c['type'] for c in combinations]
@@ -511,7 +1242,6 @@ class CryptoNetworkAnalyzer:
                     ax5.set_title('资产组合类型分布（无数据）', fontsize=14, fontweight='bold')
             
             # 6. 组合大小分布
-            ax6 = plt.subplot(2, 3, 6)
             if results.get('asset_combinations'):
                 combinations = results['asset_combinations']
                 sizes = [c['size'] for c in combinations]
@@ -526,25 +1256,44 @@ class CryptoNetworkAnalyzer:
                     ax6.text(0.5, 0.5, '无组合数据', ha='center', va='center', transform=ax6.transAxes)
                     ax6.set_title('资产组合大小分布（无数据）', fontsize=14, fontweight='bold')
             
-            plt.tight_layout()
+            fig.tight_layout()
             
-            # 保存图片
+            # 保存图片：布局已由tight_layout确定，不使用bbox_inches='tight'以省去额外的渲染测量
             if save_path:
-                plt.savefig(save_path, dpi=300, bbox_inches='tight')
+                fig.savefig(save_path, dpi=self.config.get('plot_dpi', 300))
                 logger.info(f"可视化结果已保存到: {save_path}")
             
-            plt.show()
+            if not HEADLESS:
+                plt.show()
             
         except Exception as e:
             logger.error(f"可视化失败: {e}")
     
+    def _get_figure(self) -> Figure:
+        """获取绘图用的Figure
+        
+        无图形界面时直接使用Agg画布，绕过pyplot的全局图形管理，并在多次调用间复用同一个Figure；
+        交互模式下由pyplot创建，窗口关闭后即被销毁，因此每次新建
+        """
+        if not HEADLESS:
+            return plt.figure(figsize=(20, 15))
+        if self._fig is None:
+            self._fig = Figure(figsize=(20, 15))
+            FigureCanvasAgg(self._fig)
+        else:
+            # 颜色条会额外添加坐标轴，整体清空后重新划分子图
+            self._fig.clear()
+        return self._fig
+    
     def generate_report(self, results: Dict, save_path: str = None) -> str:
         """生成分析报告"""
         try:
             logger.info("生成分析报告...")
             
+            estimator = self.cmi_estimator_used or self.config['cmi_estimator']
+            requires_java = estimator_requires_java(estimator)
             report = []
-            report.append("# 加密货币市场网络分析报告（无Java版本）")
+            report.append("# 加密货币市场网络分析报告" + ("" if requires_java else "（无Java版本）"))
             report.append(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             report.append("")
             
@@ -552,7 +1301,7 @@ class CryptoNetworkAnalyzer:
             report.append("## 数据概览")
             report.append(f"- 分析资产数量: {results['summary']['total_assets']}")
             report.append(f"- 时间窗口: {self.config['time_hours']} 小时")
-            report.append(f"- 数据点数量: {len(self.price_data)}")
+            report.append(f"- 数据点数量: {self._price_matrix.shape[1]}")
             report.append(f"- 网络密度: {results['summary'].get('network_density', 0):.3f}")
             report.append("")
             
@@ -592,8 +1341,13 @@ class CryptoNetworkAnalyzer:
             
             # 技术说明
             report.append("## 技术说明")
-            report.append("本分析使用Python原生估计器，无需Java环境：")
-            report.append(f"- 估计器类型: {self.config['cmi_estimator']}")
+            if requires_java:
+                report.append("本分析使用JIDT估计器，需要Java环境：")
+            else:
+                report.append("本分析使用Python原生估计器，无需Java环境：")
+            report.append(f"- 估计器类型: {estimator}")
+            if self.config.get('fast_mode', False):
+                report.append("- 快速预览模式: 使用JidtGaussianCMI，传递熵数值仅可与同一估计器的结果比较")
             report.append(f"- Kraskov参数k: {self.config['kraskov_k']}")
             report.append(f"- 线程数: {self.config['num_threads']}")
             report.append(f"- 置换次数: {self.config['n_perm_max_stat']}")
@@ -24,7 +24,8 @@ class PythonKraskovCMI(Estimator):
               estimation (default='USE_ALL', note that this uses *all*
               available threads on the current machine)
             - knn_finder : str [optional] - knn algorithm to use, can be
-              'scipy_kdtree' (default), 'sklearn_kdtree', or 'sklearn_balltree'
+              'scipy_kdtree' (default), 'sklearn_kdtree', 'sklearn_balltree',
+              or 'numba_bruteforce' (requires numba)
     """
 
     def __init__(self, settings):
@@ -100,24 +101,45 @@ class PythonKraskovCMI(Estimator):
                 0, self._noise_level, conditional.shape
             )
 
-        # Compute distances to kth nearest neighbors in the joint space
-        epsilon = self._compute_epsilon(
-            np.concatenate((var1, var2, conditional), axis=1), self._kraskov_k
-        )
-
-        # Count neighbors in the conditional space
-        if conditional.shape[1] > 0:
-            n_c = self._compute_n(conditional, epsilon)
+        if self._use_fused_counts():
+            # Single pass over all point pairs for the epsilon search and all
+            # neighbour counts
+            from idtxl.knn.knn_finder_numba import chebyshev_cmi_counts
+
+            n_c, n_c_var1, n_c_var2 = chebyshev_cmi_counts(
+                var1,
+                var2,
+                conditional,
+                self._kraskov_k,
+                self._knn_finder_settings["num_threads"],
+            )
             mean_digamma_nc = np.mean(digamma(n_c))
-            del n_c
+            mean_digamma_nc_var1 = np.mean(digamma(n_c_var1))
+            mean_digamma_nc_var2 = np.mean(digamma(n_c_var2))
+            del n_c, n_c_var1, n_c_var2
+        else:
+            # Compute distances to kth nearest neighbors in the joint space
+            epsilon = self._compute_epsilon(
+                np.concatenate((var1, var2, conditional), axis=1), self._kraskov_k
+            )
 
-        n_c_var1 = self._compute_n(np.concatenate((var1, conditional), axis=1), epsilon)
-        mean_digamma_nc_var1 = np.mean(digamma(n_c_var1))
-        del n_c_var1
+            # Count neighbors in the conditional space
+            if conditional.shape[1] > 0:
+                n_c = self._compute_n(conditional, epsilon)
+                mean_digamma_nc = np.mean(digamma(n_c))
+                del n_c
 
-        n_c_var2 = self._compute_n(np.concatenate((var2, conditional), axis=1), epsilon)
-        mean_digamma_nc_var2 = np.mean(digamma(n_c_var2))
-        del n_c_var2
+            n_c_var1 = self._compute_n(
+                np.concatenate((var1, conditional), axis=1), epsilon
+            )
+            mean_digamma_nc_var1 = np.mean(digamma(n_c_var1))
+            del n_c_var1
+
+            n_c_var2 = self._compute_n(
+                np.concatenate((var2, conditional), axis=1), epsilon
+            )
+            mean_digamma_nc_var2 = np.mean(digamma(n_c_var2))
+            del n_c_var2
 
         if conditional.shape[1] > 0:
             # Compute CMI
@@ -140,6 +162,13 @@ class PythonKraskovCMI(Estimator):
         """Standardise data to zero mean and unit variance."""
         return (data - np.mean(data, axis=0)) / np.std(data, axis=0)
 
+    def _use_fused_counts(self):
+        """Use the fused Numba kernel for the brute-force maximum-norm search."""
+        return (
+            self._knn_finder_name == "numba_bruteforce"
+            and self._knn_finder_settings.get("metric", "chebyshev") == "chebyshev"
+        )
+
     def _compute_epsilon(self, data: np.ndarray, k: int):
         """Compute the distance to the kth nearest neighbor for each point in x."""
         knn_finder = self._knn_finder_class(data, **self._knn_finder_settings)
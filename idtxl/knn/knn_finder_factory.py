@@ -21,5 +21,9 @@ def get_knn_finder(name: str) -> type[KnnFinder]:
         from .knn_finder_sklearn import SklearnBallTreeKnnFinder
 
         return SklearnBallTreeKnnFinder
+    elif name == "numba_bruteforce":
+        from .knn_finder_numba import NumbaBruteForceKnnFinder
+
+        return NumbaBruteForceKnnFinder
     else:
         raise KeyError(f"Unknown KnnFinder {name}")
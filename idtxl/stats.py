@@ -4,7 +4,6 @@
 import copy as cp
 
 import numpy as np
-from statsmodels.stats.multitest import fdrcorrection
 
 from . import idtxl_exceptions as ex
 from . import idtxl_utils as utils
@@ -263,8 +262,8 @@ def _perform_fdr_correction(pval, constant, alpha, n_tests):
     constant defines how the threshold is calculated. See Genovese (2002) for
     details.
 
-    Internally uses the statsmodels implementation of the Benjamini-Hochberg
-    and Benjamini-Yekutieli procedures for FDR-correction.
+    Internally uses the Benjamini-Hochberg and Benjamini-Yekutieli
+    procedures for FDR-correction as implemented in bh_fdr().
 
     References:
 
@@ -292,9 +291,9 @@ def _perform_fdr_correction(pval, constant, alpha, n_tests):
             smallest threshold for significance
     """
 
-    # Convert constant to statsmodels "method" parameter
+    # Convert constant to bh_fdr "method" parameter
     method = "indep" if constant == 1 else "negcorr"
-    sign, _ = fdrcorrection(pval, alpha=alpha, method=method)
+    sign, _ = bh_fdr(pval, alpha=alpha, method=method)
 
     # Compute smallest threshold to check for sufficiency of permutations
     if constant == 1:
@@ -305,6 +304,57 @@ def _perform_fdr_correction(pval, constant, alpha, n_tests):
     return sign, min_thresh
 
 
+def bh_fdr(pval, alpha=0.05, method="indep"):
+    """Benjamini-Hochberg/Benjamini-Yekutieli FDR-correction of p-values.
+
+    Vectorised replacement for statsmodels' fdrcorrection(), returning the
+    same rejection decisions and corrected p-values.
+
+    Args:
+        pval : array_like
+            p-values to be corrected
+        alpha : float [optional]
+            critical alpha level (default=0.05)
+        method : str [optional]
+            'indep' for the Benjamini-Hochberg procedure (independent or
+            positively correlated tests) or 'negcorr' for the
+            Benjamini-Yekutieli procedure (arbitrary dependence)
+            (default='indep')
+
+    Returns:
+        numpy array of bools
+            rejection decisions in the order of the input array
+        numpy array
+            corrected p-values in the order of the input array
+    """
+    pval = np.asarray(pval, dtype=float).ravel()
+    n_tests = pval.size
+    if method == "indep":
+        cm = 1.0
+    elif method == "negcorr":
+        cm = np.sum(1.0 / np.arange(1, n_tests + 1))
+    else:
+        raise ValueError(f"Unknown FDR-correction method {method}.")
+
+    order = np.argsort(pval, kind="mergesort")
+    pval_sorted = pval[order]
+    ranks = np.arange(1, n_tests + 1)
+
+    # Reject all hypotheses up to the largest rank whose p-value lies below
+    # its sequential threshold.
+    below = np.nonzero(pval_sorted <= alpha * ranks / (n_tests * cm))[0]
+    n_reject = below[-1] + 1 if below.size else 0
+    rejected = np.zeros(n_tests, dtype=bool)
+    rejected[order[:n_reject]] = True
+
+    corrected_sorted = np.minimum.accumulate((pval_sorted * n_tests * cm / ranks)[::-1])[
+        ::-1
+    ]
+    corrected = np.empty(n_tests)
+    corrected[order] = np.minimum(corrected_sorted, 1)
+    return rejected, corrected
+
+
 def omnibus_test(analysis_setup, data):
     """Perform an omnibus test on identified conditional variables.
 
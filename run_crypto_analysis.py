@@ -9,6 +9,7 @@ python run_crypto_analysis.py [--config config.json] [--output output_dir]
 
 import argparse
 import json
+import logging
 import os
 import sys
 from pathlib import Path
@@ -16,7 +17,26 @@ from pathlib import Path
 # 添加当前目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from crypto_network_analysis import CryptoNetworkAnalyzer
+from crypto_network_analysis import CryptoNetworkAnalyzer, estimator_requires_java
+
+# orjson为可选依赖，用于加速结果数据的JSON序列化
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 日志处理器（控制台与日志文件）由crypto_network_analysis模块统一配置
+logger = logging.getLogger(__name__)
+
+# 输出文件名：可视化图表、分析报告、结果数据
+OUTPUT_FILES = (
+    'crypto_network_analysis_no_java.png',
+    'crypto_network_report_no_java.md',
+    'analysis_results_no_java.json',
+)
+# 预处理后的价格矩阵，以内存映射方式供后续阶段读取
+PRICE_MATRIX_FILE = 'prices_no_java.npy'
 
 
 def load_config(config_path: str) -> dict:
@@ -26,10 +46,73 @@ def load_config(config_path: str) -> dict:
             config = json.load(f)
         return config
     except Exception as e:
-        print(f"❌ 配置文件加载失败: {e}")
+        logger.error("❌ 配置文件加载失败: %s", e)
         return {}
 
 
+def _to_serializable(obj):
+    """将numpy数组/标量转换为json可序列化的Python对象"""
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def save_results(results: dict, results_path: Path):
+    """保存结果数据，优先使用orjson直接输出UTF-8字节"""
+    if ORJSON_AVAILABLE:
+        results_path.write_bytes(orjson.dumps(
+            results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ))
+    else:
+        with open(results_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2, default=_to_serializable)
+
+
+def _log_summary(results: dict, output_dir: Path):
+    """将分析摘要拼接为一条日志输出"""
+    summary = results['summary']
+    abs_out = os.fspath(output_dir.resolve())
+    summary_lines = [
+        "",
+        "=" * 50,
+        "📊 分析完成！",
+        f"✅ 分析了 {summary['total_assets']} 个资产",
+        f"✅ 发现 {summary['highly_correlated_pairs']} 个高相关对",
+        f"✅ 发现 {summary['te_connections']} 个传递熵连接",
+        f"✅ 识别出 {summary['asset_combinations']} 个资产组合",
+        f"✅ 网络密度: {summary.get('network_density', 0):.3f}",
+        f"\n📁 输出文件保存在: {abs_out}",
+        f"   - {OUTPUT_FILES[0]} (可视化图表)",
+        f"   - {OUTPUT_FILES[1]} (分析报告)",
+        f"   - {OUTPUT_FILES[2]} (结果数据)",
+        f"   - {PRICE_MATRIX_FILE} (价格矩阵)",
+        "   - crypto_network_analysis.log (日志文件，位于当前工作目录)",
+    ]
+    
+    # 显示部分结果
+    if results.get('correlation_pairs'):
+        summary_lines.append("\n🔗 高相关资产对 (前5个):")
+        summary_lines.extend(
+            f"   {i}. {pair['asset1']} ↔ {pair['asset2']} (相关系数: {pair['correlation']:.4f})"
+            for i, pair in enumerate(results['correlation_pairs'][:5], 1)
+        )
+    
+    if results.get('asset_combinations'):
+        summary_lines.append("\n🎯 资产组合 (前3个):")
+        summary_lines.extend(
+            f"   {i}. {combo['type']} 组合: {', '.join(combo['assets'])} (大小: {combo['size']})"
+            for i, combo in enumerate(results['asset_combinations'][:3], 1)
+        )
+    
+    summary_lines += ["\n💡 技术说明:", f"   - 使用估计器: {summary['cmi_estimator']}"]
+    if estimator_requires_java(summary['cmi_estimator']):
+        summary_lines.append("   - 基于JIDT实现，需要Java环境")
+    else:
+        summary_lines += ["   - 无需Java环境", "   - 基于Python原生实现"]
+    logger.info("\n".join(summary_lines))
+
+
 def main():
     """主函数"""
     parser = argparse.ArgumentParser(description='加密货币网络分析系统')
@@ -47,19 +130,23 @@ def main():
                        help='传递熵阈值 (默认: 0.05)')
     parser.add_argument('--estimator', default='PythonKraskovCMI',
                        help='估计器类型 (默认: PythonKraskovCMI)')
+    parser.add_argument('--quiet', action='store_true',
+                       help='只输出警告和错误')
     
     args = parser.parse_args()
+    if args.quiet:
+        logging.getLogger().setLevel(logging.WARNING)
     
-    print("🚀 加密货币市场网络分析系统（无Java版本）")
-    print("=" * 50)
-    print(f"📁 配置文件: {args.config}")
-    print(f"📁 输出目录: {args.output}")
-    print(f"🪙 最大代币数: {args.tokens}")
-    print(f"⏰ 时间窗口: {args.hours} 小时")
-    print(f"📊 相关性阈值: {args.correlation}")
-    print(f"🔄 传递熵阈值: {args.te}")
-    print(f"🔧 估计器类型: {args.estimator}")
-    print("=" * 50)
+    logger.info("🚀 加密货币市场网络分析系统（无Java版本）")
+    logger.info("=" * 50)
+    logger.info("📁 配置文件: %s", args.config)
+    logger.info("📁 输出目录: %s", args.output)
+    logger.info("🪙 最大代币数: %d", args.tokens)
+    logger.info("⏰ 时间窗口: %d 小时", args.hours)
+    logger.info("📊 相关性阈值: %s", args.correlation)
+    logger.info("🔄 传递熵阈值: %s", args.te)
+    logger.info("🔧 估计器类型: %s", args.estimator)
+    logger.info("=" * 50)
     
     # 创建输出目录
     output_dir = Path(args.output)
@@ -84,83 +171,60 @@ def main():
     config['network_analysis']['cmi_estimator'] = args.estimator
     
     # 创建分析器
-    analyzer = CryptoNetworkAnalyzer(config)
+    try:
+        analyzer = CryptoNetworkAnalyzer(config)
+    except ValueError as e:
+        logger.error(f"❌ {e}")
+        return 1
     
     try:
         # 获取和预处理数据
-        print("\n📊 步骤 1/4: 获取和预处理数据...")
+        logger.info("📊 步骤 1/4: 获取和预处理数据...")
         if not analyzer.fetch_and_preprocess_data():
-            print("❌ 数据获取失败")
+            logger.error("❌ 数据获取失败")
             return 1
+        analyzer.persist_price_matrix(os.fspath(output_dir / PRICE_MATRIX_FILE))
         
         # 执行网络分析
-        print("\n🔍 步骤 2/4: 执行网络分析...")
+        logger.info("🔍 步骤 2/4: 执行网络分析...")
         if not analyzer.analyze_network():
-            print("❌ 网络分析失败")
+            logger.error("❌ 网络分析失败")
             return 1
         
         # 识别高度关联的资产
-        print("\n🎯 步骤 3/4: 识别高度关联的资产组合...")
+        logger.info("🎯 步骤 3/4: 识别高度关联的资产组合...")
         results = analyzer.identify_highly_correlated_assets()
         
         if not results:
-            print("❌ 资产识别失败")
+            logger.error("❌ 资产识别失败")
             return 1
         
         # 生成结果
-        print("\n📈 步骤 4/4: 生成结果...")
+        logger.info("📈 步骤 4/4: 生成结果...")
+        
+        # 预先计算输出路径
+        plot_path, report_path, results_path = (output_dir / name for name in OUTPUT_FILES)
         
         # 生成可视化
-        plot_path = output_dir / 'crypto_network_analysis_no_java.png'
         analyzer.visualize_results(results, str(plot_path))
         
         # 生成报告
-        report_path = output_dir / 'crypto_network_report_no_java.md'
         report = analyzer.generate_report(results, str(report_path))
         
         # 保存结果数据
-        results_path = output_dir / 'analysis_results_no_java.json'
-        import json
-        with open(results_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
-        
-        # 打印摘要
-        print("\n" + "=" * 50)
-        print("📊 分析完成！")
-        print(f"✅ 分析了 {results['summary']['total_assets']} 个资产")
-        print(f"✅ 发现 {results['summary']['highly_correlated_pairs']} 个高相关对")
-        print(f"✅ 发现 {results['summary']['te_connections']} 个传递熵连接")
-        print(f"✅ 识别出 {results['summary']['asset_combinations']} 个资产组合")
-        print(f"✅ 网络密度: {results['summary'].get('network_density', 0):.3f}")
-        print(f"\n📁 输出文件保存在: {output_dir.absolute()}")
-        print(f"   - crypto_network_analysis_no_java.png (可视化图表)")
-        print(f"   - crypto_network_report_no_java.md (分析报告)")
-        print(f"   - analysis_results_no_java.json (结果数据)")
-        print(f"   - crypto_network_analysis_no_java.log (日志文件)")
-        
-        # 显示部分结果
-        if results.get('correlation_pairs'):
-            print(f"\n🔗 高相关资产对 (前5个):")
-            for i, pair in enumerate(results['correlation_pairs'][:5], 1):
-                print(f"   {i}. {pair['asset1']} ↔ {pair['asset2']} (相关系数: {pair['correlation']:.4f})")
-        
-        if results.get('asset_combinations'):
-            print(f"\n🎯 资产组合 (前3个):")
-            for i, combo in enumerate(results['asset_combinations'][:3], 1):
-                print(f"   {i}. {combo['type']} 组合: {', '.join(combo['assets'])} (大小: {combo['size']})")
+        save_results(results, results_path)
         
-        print(f"\n💡 技术说明:")
-        print(f"   - 使用估计器: {args.estimator}")
-        print(f"   - 无需Java环境")
-        print(f"   - 基于Python原生实现")
+        # 输出摘要：拼接后一次写出；日志级别高于INFO（--quiet）时跳过整段格式化
+        if logger.isEnabledFor(logging.INFO):
+            _log_summary(results, output_dir)
         
         return 0
         
     except KeyboardInterrupt:
-        print("\n⚠️ 用户中断分析")
+        logger.warning("⚠️ 用户中断分析")
         return 1
     except Exception as e:
-        print(f"\n❌ 分析过程中发生错误: {e}")
+        logger.error("❌ 分析过程中发生错误: %s", e)
         return 1
 
 
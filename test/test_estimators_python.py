@@ -5,6 +5,7 @@ import pytest
 
 from idtxl.estimators_jidt import JidtKraskovCMI
 from idtxl.estimators_python import PythonKraskovCMI
+from idtxl.knn.knn_finder_factory import get_knn_finder
 
 SEED = 42
 
@@ -176,6 +177,50 @@ def test_mi_gaussian(Sigma):
     assert np.isclose(mi_jidt, mi_python, rtol=1e-4, atol=1e-4)
 
 
+@pytest.mark.parametrize("Sigma", _Sigmas_3var)
+def test_cmi_numba_knn_finder(Sigma):
+    pytest.importorskip("numba")
+    rng = np.random.default_rng(SEED)
+    S, T, C = rng.multivariate_normal(np.zeros(3), Sigma, 2_000).T
+    S, T, C = S[:, np.newaxis], T[:, np.newaxis], C[:, np.newaxis]
+
+    # The brute-force finder must reproduce the KD-tree results exactly
+    cmi_kdtree = PythonKraskovCMI(
+        {"kraskov_k": 4, "noise_level": 0, "knn_finder": "scipy_kdtree"}
+    ).estimate(var1=S, var2=T, conditional=C)
+    cmi_numba = PythonKraskovCMI(
+        {"kraskov_k": 4, "noise_level": 0, "knn_finder": "numba_bruteforce"}
+    ).estimate(var1=S, var2=T, conditional=C)
+    assert np.isclose(cmi_kdtree, cmi_numba, rtol=1e-10)
+
+    mi_kdtree = PythonKraskovCMI(
+        {"kraskov_k": 4, "noise_level": 0, "knn_finder": "scipy_kdtree"}
+    ).estimate(var1=S, var2=T)
+    mi_numba = PythonKraskovCMI(
+        {"kraskov_k": 4, "noise_level": 0, "knn_finder": "numba_bruteforce"}
+    ).estimate(var1=S, var2=T)
+    assert np.isclose(mi_kdtree, mi_numba, rtol=1e-10)
+
+    # Rounded data without noise: more than k points coincide, so the kth
+    # neighbour distance is zero and exact duplicates must still be counted
+    S, T, C = np.round(S, 1), np.round(T, 1), np.round(C, 1)
+    cmi_kdtree = PythonKraskovCMI(
+        {"kraskov_k": 4, "noise_level": 0, "knn_finder": "scipy_kdtree"}
+    ).estimate(var1=S, var2=T, conditional=C)
+    cmi_numba = PythonKraskovCMI(
+        {"kraskov_k": 4, "noise_level": 0, "knn_finder": "numba_bruteforce"}
+    ).estimate(var1=S, var2=T, conditional=C)
+    assert np.isfinite(cmi_numba)
+    assert np.isclose(cmi_kdtree, cmi_numba, rtol=1e-10)
+
+    data = np.hstack((S, C))
+    r = np.zeros(data.shape[0])
+    assert np.array_equal(
+        get_knn_finder("scipy_kdtree")(data).count_neighbors(data, r),
+        get_knn_finder("numba_bruteforce")(data).count_neighbors(data, r),
+    )
+
+
 if __name__ == "__main__":
     for sigma in _Sigmas_3var:
         test_cmi_gaussian(sigma)
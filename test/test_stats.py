@@ -447,6 +447,27 @@ def test_fdr_sorting():
     assert np.array_equal(pval_sorted[sign], sorted(pval_unsorted[sign_unsorted]))
 
 
+def test_bh_fdr():
+    # Test numpy FDR-correction against the statsmodels implementation
+    multitest = pytest.importorskip("statsmodels.stats.multitest")
+    rng = np.random.default_rng(0)
+    pval = np.concatenate((rng.uniform(0, 0.01, 20), rng.uniform(0, 1, 200)))
+    rng.shuffle(pval)
+    for method in ["indep", "negcorr"]:
+        sign, corrected = stats.bh_fdr(pval, alpha=0.05, method=method)
+        sign_sm, corrected_sm = multitest.fdrcorrection(
+            pval, alpha=0.05, method=method
+        )
+        assert np.array_equal(sign, sign_sm), "Rejections differ from statsmodels."
+        assert np.allclose(
+            corrected, corrected_sm
+        ), "Corrected p-values differ from statsmodels."
+
+    sign, corrected = stats.bh_fdr(np.array([0.01, 0.05, 0.1, 0.2, 0.3]), alpha=0.05)
+    assert np.array_equal(sign, [True, False, False, False, False])
+    assert np.allclose(corrected, [0.05, 0.125, 0.1666667, 0.25, 0.3])
+
+
 def test_ais_fdr():
     settings = {"n_perm_max_seq": 1000, "n_perm_mi": 1000}
     process_0 = {
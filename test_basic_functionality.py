@@ -20,7 +20,7 @@ def test_idtxl_imports():
         from idtxl.data import Data
         from idtxl.multivariate_te import MultivariateTE
         from idtxl.multivariate_mi import MultivariateMI
-        from idtxl.stats import fdrcorrection
+        from idtxl.stats import bh_fdr
         print("✅ IDTxl核心模块导入成功")
         return True
     except Exception as e:
@@ -64,16 +64,16 @@ def test_basic_idtxl_functionality():
         print(f"❌ IDTxl基本功能测试失败: {e}")
         return False
 
-def test_statsmodels_functionality():
-    """测试statsmodels功能"""
-    print("🧪 测试statsmodels功能...")
+def test_fdr_functionality():
+    """测试FDR校正功能"""
+    print("🧪 测试FDR校正功能...")
     
     try:
-        from statsmodels.stats.multitest import fdrcorrection
+        from idtxl.stats import bh_fdr
         
-        # 测试FDR校正
-        p_values = [0.01, 0.05, 0.1, 0.2, 0.3]
-        corrected_p, rejected = fdrcorrection(p_values, alpha=0.05)
+        # 测试FDR校正（NumPy实现的Benjamini-Hochberg）
+        p_values = np.array([0.01, 0.05, 0.1, 0.2, 0.3])
+        rejected, corrected_p = bh_fdr(p_values, alpha=0.05)
         
         print(f"✅ FDR校正测试成功:")
         print(f"   原始p值: {p_values}")
@@ -82,7 +82,7 @@ def test_statsmodels_functionality():
         
         return True
     except Exception as e:
-        print(f"❌ statsmodels功能测试失败: {e}")
+        print(f"❌ FDR校正功能测试失败: {e}")
         return False
 
 def main():
@@ -104,9 +104,9 @@ def main():
     result = test_basic_idtxl_functionality()
     test_results.append(("IDTxl基本功能", result))
     
-    # 测试4: statsmodels功能
-    result = test_statsmodels_functionality()
-    test_results.append(("statsmodels功能", result))
+    # 测试4: FDR校正功能
+    result = test_fdr_functionality()
+    test_results.append(("FDR校正功能", result))
     
     # 输出测试结果
     print("\n" + "=" * 50)
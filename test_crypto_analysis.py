@@ -13,15 +13,15 @@ from pathlib import Path
 # 添加当前目录到Python路径
 sys.path.insert(0, str(Path(__file__).parent))
 
-from crypto_network_analysis import CryptoNetworkAnalyzer
+from crypto_network_analysis import CryptoNetworkAnalyzer, HyperliquidDataFetcher
+from idtxl.data import Data
+from idtxl.multivariate_te import MultivariateTE
 
 
 def test_data_fetcher():
     """测试数据获取器"""
     print("🧪 测试数据获取器...")
     
-    from crypto_network_analysis import HyperliquidDataFetcher
-    
     fetcher = HyperliquidDataFetcher()
     
     # 测试获取代币信息
@@ -44,26 +44,19 @@ def test_analyzer_with_synthetic_data():
     print("🧪 测试分析器（合成数据）...")
     
     # 创建合成数据
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     n_assets = 10
     n_samples = 100
     
-    # 生成相关的价格数据
-    base_prices = np.random.randn(n_samples)
-    price_data = {}
-    
-    for i in range(n_assets):
-        if i < 3:  # 前3个资产高度相关
-            noise = np.random.randn(n_samples) * 0.1
-            price_data[f'ASSET_{i}'] = base_prices + noise
-        elif i < 6:  # 中间3个资产中等相关
-            noise = np.random.randn(n_samples) * 0.3
-            price_data[f'ASSET_{i}'] = base_prices * 0.5 + noise
-        else:  # 后4个资产独立
-            price_data[f'ASSET_{i}'] = np.random.randn(n_samples)
-    
-    # 创建DataFrame
-    df = pd.DataFrame(price_data)
+    # 生成相关的价格数据：前3个资产高度相关，中间3个资产中等相关，后4个资产独立
+    # 直接按(assets, samples)布局生成，无需经过DataFrame
+    asset_idx = np.arange(n_assets)
+    base_prices = rng.standard_normal(n_samples)
+    mix = np.where(asset_idx < 3, 1.0, np.where(asset_idx < 6, 0.5, 0.0))
+    scales = np.where(asset_idx < 3, 0.1, np.where(asset_idx < 6, 0.3, 1.0))
+    noise = rng.standard_normal((n_assets, n_samples))
+    data = mix[:, None] * base_prices[None, :] + noise * scales[:, None]
+    cols = [f'ASSET_{i}' for i in range(n_assets)]
     
     # 创建分析器
     config = {
@@ -78,7 +71,8 @@ def test_analyzer_with_synthetic_data():
     }
     
     analyzer = CryptoNetworkAnalyzer(config)
-    analyzer.price_data = df
+    analyzer._price_matrix = data.astype(np.float32, copy=False)
+    analyzer._asset_names = cols
     
     # 测试网络分析
     print("  执行网络分析...")
@@ -125,45 +119,37 @@ def test_performance():
         (20, 200, "大规模"),
     ]
     
+    # 分析器和基础设置只创建一次，各规模复用
+    network_analysis = MultivariateTE()
+    base_settings = {
+        'cmi_estimator': 'JidtKraskovCMI',
+        'max_lag_sources': 5,
+        'min_lag_sources': 1,
+        'max_lag_target': 3,
+        'tau_sources': 1,
+        'tau_target': 1,
+        'n_perm_max_stat': 10,  # 减少置换次数
+        'n_perm_min_stat': 10,
+        'n_perm_omnibus': 20,
+    }
+    
+    # 按最大规模一次性生成测试数据，各规模取切片视图
+    rng = np.random.default_rng(42)
+    max_assets = max(case[0] for case in test_cases)
+    max_samples = max(case[1] for case in test_cases)
+    max_data = rng.standard_normal((max_assets, max_samples))
+    
     for n_assets, n_samples, scale_name in test_cases:
         print(f"  测试 {scale_name} ({n_assets}个资产, {n_samples}个样本)...")
         
-        # 生成测试数据
-        np.random.seed(42)
-        data = np.random.randn(n_assets, n_samples)
-        
-        # 创建分析器
-        config = {
-            'max_tokens': n_assets,
-            'n_perm_max_stat': 10,  # 减少置换次数
-            'n_perm_min_stat': 10,
-            'n_perm_omnibus': 20,
-        }
-        
-        analyzer = CryptoNetworkAnalyzer(config)
-        
-        # 准备数据
-        data_array = data
-        from idtxl.data import Data
-        idtxl_data = Data(data_array, dim_order='ps')
+        # 准备数据（标准正态数据，无需IDTxl再做标准化）
+        idtxl_data = Data(max_data[:n_assets, :n_samples], dim_order='ps', normalise=False)
         
         # 测试网络分析性能
         start_time = time.time()
         try:
-            from idtxl.multivariate_te import MultivariateTE
-            network_analysis = MultivariateTE()
-            settings = {
-                'cmi_estimator': 'JidtKraskovCMI',
-                'max_lag_sources': 5,
-                'min_lag_sources': 1,
-                'max_lag_target': 3,
-                'tau_sources': 1,
-                'tau_target': 1,
-                'n_perm_max_stat': 10,
-                'n_perm_min_stat': 10,
-                'n_perm_omnibus': 20,
-            }
-            
+            # IDTxl会向settings写入默认值，每次传入副本
+            settings = dict(base_settings)
             results = network_analysis.analyse_network(settings=settings, data=idtxl_data)
             analysis_time = time.time() - start_time
             
@@ -194,8 +180,59 @@ def test_configuration():
     assert analyzer2.config['max_tokens'] == 15
     assert analyzer2.config['time_hours'] == 72
     assert analyzer2.config['correlation_threshold'] == 0.8
+    assert analyzer2.config['kraskov_k'] == analyzer1.config['kraskov_k']  # 未指定的参数保留默认值
     print(f"✅ 配置合并正确")
 
+    # 验证无效配置在构造时被拒绝
+    try:
+        CryptoNetworkAnalyzer({'max_tokens': 0})
+        assert False, "无效配置未被拒绝"
+    except ValueError:
+        print(f"✅ 无效配置校验正确")
+
+
+def test_preprocessing():
+    """测试数据预处理"""
+    print("🧪 测试数据预处理...")
+    
+    rng = np.random.default_rng(0)
+    n_samples = 50
+    prices = pd.DataFrame({
+        'A': 100 * np.exp(np.cumsum(0.01 * rng.standard_normal(n_samples))),
+        'B': 50 * np.exp(np.cumsum(0.01 * rng.standard_normal(n_samples))),
+        'FLAT': np.full(n_samples, 10.0),  # 无波动的资产
+    })
+    
+    analyzer = CryptoNetworkAnalyzer()
+    analyzer.price_data = prices
+    assert analyzer._preprocess_data(), "预处理失败"
+    assert analyzer._asset_names == ['A', 'B'], f"无波动资产未被剔除: {analyzer._asset_names}"
+    assert analyzer._price_matrix.shape == (2, n_samples - 1), "时间点不应被删除"
+    assert np.isfinite(analyzer._price_matrix).all(), "预处理结果含非有限值"
+    
+    # 所有资产都无波动时返回False
+    analyzer = CryptoNetworkAnalyzer()
+    analyzer.price_data = prices[['FLAT']]
+    assert not analyzer._preprocess_data(), "无可用数据时应返回False"
+    print(f"✅ 数据预处理正确")
+
+
+def test_asset_grouping():
+    """测试资产分组（连通分量）"""
+    print("🧪 测试资产分组...")
+    
+    analyzer = CryptoNetworkAnalyzer()
+    analyzer._asset_names = ['A', 'B', 'C', 'D', 'E']
+    
+    # 后出现的B-C连接需要把已有的两组合并为一组
+    edges = [('A', 'B'), ('C', 'D'), ('B', 'C')]
+    for directed in (False, True):
+        groups = analyzer._connected_asset_groups(edges, directed=directed)
+        assert len(groups) == 1, f"资产组数量错误: {groups}"
+        assert sorted(groups[0]) == ['A', 'B', 'C', 'D'], f"资产组成员错误: {groups}"
+    assert analyzer._connected_asset_groups([], directed=False) == []
+    print(f"✅ 资产分组正确")
+
 
 def main():
     """主测试函数"""
@@ -236,6 +273,22 @@ def main():
         print(f"❌ 配置系统测试失败: {e}")
         test_results.append(("配置系统", False))
     
+    # 测试5: 数据预处理
+    try:
+        test_preprocessing()
+        test_results.append(("数据预处理", True))
+    except Exception as e:
+        print(f"❌ 数据预处理测试失败: {e}")
+        test_results.append(("数据预处理", False))
+    
+    # 测试6: 资产分组
+    try:
+        test_asset_grouping()
+        test_results.append(("资产分组", True))
+    except Exception as e:
+        print(f"❌ 资产分组测试失败: {e}")
+        test_results.append(("资产分组", False))
+    
     # 输出测试结果
     print("\n" + "=" * 50)
     print("📊 测试结果汇总:")